@@ -7,12 +7,84 @@ Provides command-line utilities for server management and testing
 import click
 import asyncio
 import json
+import os
+import stat
+import tempfile
 import yaml
 from pathlib import Path
 from typing import Dict, Any
 
+from netmiko import ConnectHandler
+from netmiko.exceptions import NetmikoTimeoutException, NetmikoAuthenticationException
+
+# Prefer the libyaml C bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
 from mcp_server import NetMikoMCPServer, DeviceConfig
 
+DEVICE_TYPES = (
+    "cisco_ios", "cisco_nxos", "cisco_xr", "cisco_asa",
+    "arista_eos", "juniper_junos", "hp_procurve", "dell_force10",
+    "paloalto_panos", "fortinet", "checkpoint_gaia", "linux"
+)
+DEVICE_TYPES_TEXT = "Supported device types:\n" + "\n".join(f"  - {t}" for t in DEVICE_TYPES)
+
+
+def _has_str_keys(data: Any) -> bool:
+    """True if every mapping in data has only string keys, i.e. it survives a JSON round-trip"""
+    if isinstance(data, dict):
+        return all(isinstance(k, str) and _has_str_keys(v) for k, v in data.items())
+    if isinstance(data, list):
+        return all(_has_str_keys(item) for item in data)
+    return True
+
+
+def _write_config_cache(cache_path: Path, version: str, config_data: Any, mode: int):
+    """Atomically write the sidecar cache with the config file's permissions"""
+    fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name + ".")
+    try:
+        # The cache holds the config's credentials, so it must be no more readable than the config
+        os.chmod(tmp_path, mode)
+        with os.fdopen(fd, 'w') as f:
+            f.write(version)
+            json.dump(config_data, f)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_config(config: str) -> Dict[str, Any]:
+    """Load a YAML config, reusing a JSON sidecar cache while the file is unchanged"""
+    cache_path = Path(config + ".cache.json")
+    config_stat = os.stat(config)
+    # mtime alone misses same-mtime replacements (cp -p, rsync -a, coarse timestamps);
+    # ctime also changes on any write or utime and cannot be set back by the writer
+    version = (f"# content-version: {config_stat.st_mtime_ns}-{config_stat.st_ctime_ns}"
+               f"-{config_stat.st_size}-{config_stat.st_ino}\n")
+    
+    try:
+        with open(cache_path, 'r') as f:
+            if f.readline() == version:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+    
+    with open(config, 'r') as f:
+        config_data = yaml.load(f, Loader=SafeLoader)
+    
+    # Caching is best effort; YAML that JSON cannot represent exactly is re-parsed each time
+    if _has_str_keys(config_data):
+        try:
+            _write_config_cache(cache_path, version, config_data, stat.S_IMODE(config_stat.st_mode))
+        except (OSError, TypeError, ValueError):
+            pass
+    
+    return config_data
+
 
 @click.group()
 def cli():
@@ -30,13 +102,12 @@ def start(config):
     
     # Load configuration if provided
     if config:
-        with open(config, 'r') as f:
-            config_data = yaml.safe_load(f)
-            
+        config_data = load_config(config)
+        
         # Pre-configure devices from config file
         if 'devices' in config_data:
             for device_id, device_config in config_data['devices'].items():
-                server.device_configs[device_id] = DeviceConfig(**device_config)
+                server.add_device_config(device_id, DeviceConfig(**device_config))
                 click.echo(f"Loaded device configuration: {device_id}")
     
     # Run the server
@@ -59,9 +130,6 @@ def test_connection(host, device_type, username, password, port, timeout):
     """Test connection to a network device"""
     click.echo(f"Testing connection to {host}...")
     
-    from netmiko import ConnectHandler
-    from netmiko.exceptions import NetmikoTimeoutException, NetmikoAuthenticationException
-    
     device_params = {
         'device_type': device_type,
         'host': host,
@@ -95,15 +163,7 @@ def test_connection(host, device_type, username, password, port, timeout):
 @cli.command()
 def list_device_types():
     """List supported device types"""
-    device_types = [
-        "cisco_ios", "cisco_nxos", "cisco_xr", "cisco_asa",
-        "arista_eos", "juniper_junos", "hp_procurve", "dell_force10",
-        "paloalto_panos", "fortinet", "checkpoint_gaia", "linux"
-    ]
-    
-    click.echo("Supported device types:")
-    for device_type in device_types:
-        click.echo(f"  - {device_type}")
+    click.echo(DEVICE_TYPES_TEXT)
 
 
 @cli.command()
@@ -137,7 +197,7 @@ def generate_config(output):
         }
     }
     
-    config_yaml = yaml.dump(config, default_flow_style=False, sort_keys=False)
+    config_yaml = yaml.dump(config, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
     
     if output:
         with open(output, 'w') as f:
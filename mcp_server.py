@@ -5,9 +5,14 @@ Provides MCP protocol interface for managing network devices via SSH using NetMi
 """
 
 import asyncio
+import functools
 import json
 import logging
-from typing import Dict, List, Optional, Any, Union
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import ClassVar, Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass
 from contextlib import asynccontextmanager
 
@@ -17,15 +22,35 @@ from mcp.server import NotificationOptions, Server
 from mcp.server.models import InitializationOptions
 from netmiko import ConnectHandler
 from netmiko.exceptions import NetmikoTimeoutException, NetmikoAuthenticationException
+from netmiko.utilities import get_structured_data_textfsm, get_template_dir
+import textfsm
+from textfsm import clitable
 import yaml
 
+# Use uvloop's faster event loop when it is installed (it is unavailable on Windows)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+# Serialize responses with orjson's C encoder when it is installed
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, indent=2)
+
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DeviceConfig:
     """Configuration for a network device"""
     host: str
@@ -36,23 +61,489 @@ class DeviceConfig:
     secret: Optional[str] = None
     timeout: int = 30
     session_timeout: int = 60
+    fast_cli: bool = True
+
+
+# Pool key: every parameter the session was opened with, so a session is only
+# reused by a caller presenting the same credentials
+PoolKey = Tuple[str, int, str, str, Optional[str], str, int, bool]
+
+
+def pool_key(config: DeviceConfig) -> PoolKey:
+    """Pool key for the connection parameters in config"""
+    return (config.host, config.port, config.username, config.password, config.secret,
+            config.device_type, config.timeout, config.fast_cli)
+
+
+POOL_MAX_SIZE = int(os.environ.get("CONNECTION_POOL_MAX_SIZE", "100"))
+POOL_IDLE_TIMEOUT = float(os.environ.get("CONNECTION_POOL_IDLE_TIMEOUT", "300"))
+POOL_MAX_AGE = float(os.environ.get("CONNECTION_POOL_MAX_AGE", "3600"))
+POOL_REAP_INTERVAL = 30
+
+# Seconds to wait for device output when pushing config without per-line echo checks
+CONFIG_READ_TIMEOUT = 30
+
+# Coalesce MCP responses written to stdout (opt-in via MCP_BATCH_STDIO=1)
+BATCH_STDIO = os.environ.get("MCP_BATCH_STDIO") == "1"
+BATCH_STDIO_MAX_BUFFER = 4096
+BATCH_STDIO_INTERVAL = 0.001
+
+# Threads available for blocking NetMiko calls, i.e. devices served in parallel
+EXECUTOR_MAX_WORKERS = int(os.environ.get("NETMIKO_MCP_WORKERS", "32"))
+
+
+@dataclass
+class KeyLock:
+    """Per-key lock plus a count of tasks holding or waiting on it"""
+    lock: asyncio.Lock
+    users: int = 0
+
+
+@dataclass
+class PooledConnection:
+    """A live connection held by the pool"""
+    connection: ConnectHandler
+    last_used: float
+    created: float
+    cached_prompt: Optional[str] = None
+
+
+class ConnectionPool:
+    """Keyed pool of NetMiko connections with idle-timeout, max-age and max-size eviction"""
+
+    def __init__(self, run_blocking, max_size: int = POOL_MAX_SIZE,
+                 idle_timeout: float = POOL_IDLE_TIMEOUT, max_age: float = POOL_MAX_AGE):
+        self._run_blocking = run_blocking
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_age = max_age
+        self._entries: Dict[PoolKey, PooledConnection] = {}
+        self._key_locks: Dict[PoolKey, KeyLock] = {}
+        self._channel_locks: Dict[PoolKey, KeyLock] = {}
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: PoolKey) -> bool:
+        return key in self._entries
+
+    def _is_expired(self, entry: PooledConnection, now: float) -> bool:
+        return now - entry.last_used > self.idle_timeout or now - entry.created > self.max_age
+
+    def _is_busy(self, key: PoolKey) -> bool:
+        key_lock = self._channel_locks.get(key)
+        return key_lock is not None and key_lock.users > 0
+
+    @asynccontextmanager
+    async def _hold(self, locks: Dict[PoolKey, KeyLock], key: PoolKey):
+        """Hold the lock for key in locks, counting this task as a user until it is done"""
+        key_lock = locks.get(key)
+        if key_lock is None:
+            key_lock = locks[key] = KeyLock(asyncio.Lock())
+        key_lock.users += 1
+        try:
+            async with key_lock.lock:
+                yield
+        finally:
+            key_lock.users -= 1
+
+    def channel_lock(self, key: PoolKey):
+        """Lock serializing calls on the SSH channel of key's connection"""
+        return self._hold(self._channel_locks, key)
+
+    async def acquire(self, key: PoolKey, factory) -> Tuple[ConnectHandler, bool]:
+        """Return a live connection for key, creating one with await factory() on a miss.
+
+        The second element of the result is True when an existing connection was reused.
+        """
+        try:
+            async with self._hold(self._key_locks, key):
+                entry = self._entries.get(key)
+                if entry is not None and not self._is_expired(entry, time.monotonic()):
+                    async with self.channel_lock(key):
+                        alive = await self._run_blocking(entry.connection.is_alive)
+                    if alive:
+                        entry.last_used = time.monotonic()
+                        return entry.connection, True
+                if entry is not None:
+                    await self.remove(key)
+
+                connection = await factory()
+                evicted = None
+                async with self._lock:
+                    existing = self._entries.get(key)
+                    if existing is None and len(self._entries) >= self.max_size:
+                        # Never evict a session in the middle of a call
+                        idle_keys = [k for k in self._entries if not self._is_busy(k)]
+                        if idle_keys:
+                            lru_key = min(idle_keys, key=lambda k: self._entries[k].last_used)
+                            evicted = (lru_key, self._entries.pop(lru_key))
+                    if existing is None:
+                        now = time.monotonic()
+                        self._entries[key] = PooledConnection(connection, now, now)
+                if existing is not None:
+                    # Never let a second session for key live outside the pool
+                    await self._disconnect(connection)
+                    existing.last_used = time.monotonic()
+                    return existing.connection, True
+                if evicted is not None:
+                    await self._close(*evicted)
+                return connection, False
+        finally:
+            # A failed connect must not leave its key lock behind
+            self._forget_locks(key)
+
+    def get(self, key: PoolKey) -> Optional[PooledConnection]:
+        """Return the pool entry for key without touching it"""
+        return self._entries.get(key)
+
+    def release(self, key: PoolKey):
+        """Mark the connection for key as just used"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.last_used = time.monotonic()
+
+    async def remove(self, key: PoolKey):
+        """Drop and disconnect the connection for key"""
+        async with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is not None:
+            await self._close(key, entry)
+
+    async def reap(self) -> List[PoolKey]:
+        """Disconnect idle or aged-out connections and return their keys"""
+        now = time.monotonic()
+        async with self._lock:
+            # Busy sessions are left for a later pass
+            expired = [key for key, entry in self._entries.items()
+                       if self._is_expired(entry, now) and not self._is_busy(key)]
+            entries = [(key, self._entries.pop(key)) for key in expired]
+        for key, entry in entries:
+            await self._close(key, entry)
+        return expired
+
+    async def close_all(self):
+        """Disconnect every pooled connection"""
+        async with self._lock:
+            entries = list(self._entries.items())
+            self._entries.clear()
+        for key, entry in entries:
+            await self._close(key, entry)
+
+    async def _close(self, key: PoolKey, entry: PooledConnection):
+        async with self.channel_lock(key):
+            await self._disconnect(entry.connection)
+        self._forget_locks(key)
+
+    async def _disconnect(self, connection: ConnectHandler):
+        try:
+            await self._run_blocking(connection.disconnect)
+        except Exception as e:
+            logger.warning(f"Error closing pooled connection: {str(e)}")
+
+    def _forget_locks(self, key: PoolKey):
+        """Drop the locks of a key that has left the pool, unless a task holds or awaits them"""
+        if key in self._entries:
+            return
+        for locks in (self._key_locks, self._channel_locks):
+            key_lock = locks.get(key)
+            if key_lock is not None and key_lock.users == 0:
+                del locks[key]
+
+
+class BatchedStdout:
+    """Stdout stream for stdio_server that coalesces per-message flushes into fewer writes
+
+    stdio_server writes and flushes every response; here a flush only schedules a write
+    after a short interval, so responses produced together share one os.write call.
+    A failed background write is re-raised from the next call, as an unbatched flush would.
+    """
+
+    def __init__(self, fd: int = 1, max_buffer: int = BATCH_STDIO_MAX_BUFFER,
+                 interval: float = BATCH_STDIO_INTERVAL):
+        self._fd = fd
+        self._max_buffer = max_buffer
+        self._interval = interval
+        self._buffer = bytearray()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+        self._error: Optional[Exception] = None
+
+    def _raise_pending_error(self):
+        if self._error is not None:
+            raise self._error
+
+    async def write(self, data: str) -> int:
+        self._raise_pending_error()
+        self._buffer += data.encode("utf-8")
+        if len(self._buffer) >= self._max_buffer:
+            await self._drain()
+        return len(data)
+
+    async def flush(self):
+        self._raise_pending_error()
+        if self._buffer and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._delayed_drain())
+
+    async def aclose(self):
+        """Write out anything still buffered"""
+        if self._flush_task is not None:
+            await self._flush_task
+        self._raise_pending_error()
+        await self._drain()
+
+    async def _delayed_drain(self):
+        await asyncio.sleep(self._interval)
+        self._flush_task = None
+        try:
+            await self._drain()
+        except Exception as e:
+            # Nobody awaits this task, so keep the error for the caller's next write/flush
+            self._error = e
+
+    async def _drain(self):
+        async with self._write_lock:
+            if not self._buffer:
+                return
+            data = bytes(self._buffer)
+            self._buffer.clear()
+            # A full pipe blocks, so write off the event loop
+            await asyncio.to_thread(self._write_all, data)
+
+    def _write_all(self, data: bytes):
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._fd, view):]
+
+
+# Tool definitions are static, so build them once at import
+TOOLS = [
+    types.Tool(
+        name="connect_device",
+        description="Connect to a network device",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "device_id": {"type": "string", "description": "Unique device identifier"},
+                "host": {"type": "string", "description": "Device IP address or hostname"},
+                "device_type": {"type": "string", "description": "Device type (cisco_ios, cisco_nxos, etc.)"},
+                "username": {"type": "string", "description": "SSH username"},
+                "password": {"type": "string", "description": "SSH password"},
+                "port": {"type": "integer", "description": "SSH port (default: 22)", "default": 22},
+                "secret": {"type": "string", "description": "Enable secret (optional)"},
+                "timeout": {"type": "integer", "description": "Connection timeout (default: 30)", "default": 30},
+                "fast_cli": {"type": "boolean", "description": "Use NetMiko fast_cli timing; disable for slow devices", "default": True}
+            },
+            "required": ["device_id", "host", "device_type", "username", "password"]
+        }
+    ),
+    types.Tool(
+        name="disconnect_device",
+        description="Disconnect from a network device",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "device_id": {"type": "string", "description": "Device identifier to disconnect"}
+            },
+            "required": ["device_id"]
+        }
+    ),
+    types.Tool(
+        name="send_command",
+        description="Send a command to a connected network device",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "device_id": {"type": "string", "description": "Device identifier"},
+                "command": {"type": "string", "description": "Command to execute"},
+                "use_textfsm": {"type": "boolean", "description": "Parse output with TextFSM", "default": False},
+                "strip_prompt": {"type": "boolean", "description": "Strip device prompt from output", "default": True},
+                "strip_command": {"type": "boolean", "description": "Strip command from output", "default": True}
+            },
+            "required": ["device_id", "command"]
+        }
+    ),
+    types.Tool(
+        name="send_config_commands",
+        description="Send configuration commands to a network device",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "device_id": {"type": "string", "description": "Device identifier"},
+                "commands": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of configuration commands"
+                },
+                "exit_config_mode": {"type": "boolean", "description": "Exit config mode after commands", "default": True},
+                "cmd_verify": {"type": "boolean", "description": "Wait for each command echo before sending the next", "default": False}
+            },
+            "required": ["device_id", "commands"]
+        }
+    ),
+    types.Tool(
+        name="get_device_info",
+        description="Get basic device information",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "device_id": {"type": "string", "description": "Device identifier"}
+            },
+            "required": ["device_id"]
+        }
+    ),
+    types.Tool(
+        name="list_connected_devices",
+        description="List all currently connected devices",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    )
+]
+
+
+@functools.lru_cache(maxsize=1)
+def _get_textfsm_index() -> Tuple[clitable.CliTable, str]:
+    """Load the TextFSM index (NET_TEXTFSM or ntc-templates) once per process"""
+    template_dir = get_template_dir()
+    return clitable.CliTable("index", template_dir), template_dir
+
+
+@functools.lru_cache(maxsize=512)
+def _get_textfsm_template(device_type: str, command: str) -> Optional[textfsm.TextFSM]:
+    """Compiled TextFSM template for a platform and command, or None if not indexed"""
+    try:
+        cli_table, template_dir = _get_textfsm_index()
+    except ValueError:
+        return None
+    
+    row = cli_table.index.GetRowMatch({"Platform": device_type, "Command": command})
+    if not row:
+        return None
+    template_file = cli_table.index.index[row]["Template"]
+    if ":" in template_file:
+        # Multi-template entries are merged by CliTable; leave those to NetMiko
+        return None
+    
+    with open(os.path.join(template_dir, template_file), "r") as f:
+        return textfsm.TextFSM(f)
+
+
+# Cached templates carry parse state; parsing is CPU-bound, so one lock costs no parallelism
+_textfsm_lock = threading.Lock()
+
+
+def _parse_textfsm(device_type: str, command: str, raw_output: str) -> Union[str, List[Dict[str, Any]]]:
+    """Parse command output with a cached TextFSM template, matching NetMiko's use_textfsm result"""
+    # NetMiko strips the command before its index lookup; doing the same also keeps cache keys canonical
+    command = command.strip()
+    template = _get_textfsm_template(device_type, command)
+    if template is None:
+        return get_structured_data_textfsm(raw_output, platform=device_type, command=command)
+    
+    with _textfsm_lock:
+        template.Reset()
+        records = template.ParseText(raw_output)
+        header = [name.lower() for name in template.header]
+        structured_data = [dict(zip(header, record)) for record in records]
+    
+    return structured_data if structured_data else raw_output
+
+
+ERR_NOT_CONNECTED_TMPL = "Device {} is not connected. Please connect first."
+
+
+def _text(msg: str) -> list[types.TextContent]:
+    """Wrap a message as a single-item MCP text response"""
+    return [types.TextContent(type="text", text=msg)]
 
 
 class NetMikoMCPServer:
     """MCP Server implementation for NetMiko network device management"""
     
+    # Shared by every server in the process so worker threads are reused, not multiplied
+    _executor: ClassVar[Optional[ThreadPoolExecutor]] = None
+    
     def __init__(self):
         self.server = Server("netmiko-mcp-server")
         self.connections: Dict[str, ConnectHandler] = {}
         self.device_configs: Dict[str, DeviceConfig] = {}
+        self._configs_version = 0
+        self._resources_cache: Optional[list[types.Resource]] = None
+        self._resources_cache_version = -1
+        self._pool = ConnectionPool(self._run_blocking)
+        self._device_keys: Dict[str, PoolKey] = {}
+        self._tool_dispatch = {
+            "connect_device": self._connect_device,
+            "disconnect_device": self._disconnect_device,
+            "send_command": self._send_command,
+            "send_config_commands": self._send_config_commands,
+            "get_device_info": self._get_device_info,
+            "list_connected_devices": self._list_connected_devices,
+        }
         self._setup_handlers()
     
+    def add_device_config(self, device_id: str, config: DeviceConfig):
+        """Register or replace a device configuration"""
+        self.device_configs[device_id] = config
+        self._configs_version += 1
+    
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        """Return the process-wide executor for blocking NetMiko calls, creating it on first use"""
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(max_workers=EXECUTOR_MAX_WORKERS,
+                                               thread_name_prefix="netmiko")
+        return cls._executor
+    
+    async def _run_blocking(self, fn, *args, **kwargs):
+        """Run a blocking NetMiko call in the executor without stalling the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(), functools.partial(fn, *args, **kwargs)
+        )
+    
+    async def _run_on_device(self, device_id: str, fn, *args, **kwargs):
+        """Run a blocking call against a device's connection, one call per SSH channel at a time"""
+        key = self._device_keys[device_id]
+        try:
+            async with self._pool.channel_lock(key):
+                result = await self._run_blocking(fn, *args, **kwargs)
+        except Exception:
+            # The session may be disrupted, so the prompt has to be probed again
+            self._invalidate_prompt(device_id)
+            raise
+        self._pool.release(key)
+        return result
+    
+    async def _get_prompt(self, device_id: str) -> str:
+        """Return the device prompt, probing the device only once per session"""
+        entry = self._pool.get(self._device_keys[device_id])
+        if entry is not None and entry.cached_prompt is not None:
+            return entry.cached_prompt
+        
+        prompt = await self._run_on_device(device_id, self.connections[device_id].find_prompt)
+        if entry is not None:
+            entry.cached_prompt = prompt
+        return prompt
+    
+    def _invalidate_prompt(self, device_id: str):
+        """Forget the cached prompt for a device's session"""
+        key = self._device_keys.get(device_id)
+        entry = self._pool.get(key) if key is not None else None
+        if entry is not None:
+            entry.cached_prompt = None
+    
     def _setup_handlers(self):
         """Setup MCP server handlers"""
         
         @self.server.list_resources()
         async def handle_list_resources() -> list[types.Resource]:
             """List available network devices as resources"""
+            if self._resources_cache_version == self._configs_version:
+                return self._resources_cache
+            
             resources = []
             for device_id, config in self.device_configs.items():
                 resources.append(
@@ -63,6 +554,8 @@ class NetMikoMCPServer:
                         mimeType="application/json"
                     )
                 )
+            self._resources_cache = resources
+            self._resources_cache_version = self._configs_version
             return resources
         
         @self.server.read_resource()
@@ -85,122 +578,31 @@ class NetMikoMCPServer:
                 "connected": device_id in self.connections
             }
             
-            return json.dumps(device_info, indent=2)
+            return _dumps(device_info)
         
         @self.server.list_tools()
         async def handle_list_tools() -> list[types.Tool]:
             """List available tools for network device management"""
-            return [
-                types.Tool(
-                    name="connect_device",
-                    description="Connect to a network device",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "device_id": {"type": "string", "description": "Unique device identifier"},
-                            "host": {"type": "string", "description": "Device IP address or hostname"},
-                            "device_type": {"type": "string", "description": "Device type (cisco_ios, cisco_nxos, etc.)"},
-                            "username": {"type": "string", "description": "SSH username"},
-                            "password": {"type": "string", "description": "SSH password"},
-                            "port": {"type": "integer", "description": "SSH port (default: 22)", "default": 22},
-                            "secret": {"type": "string", "description": "Enable secret (optional)"},
-                            "timeout": {"type": "integer", "description": "Connection timeout (default: 30)", "default": 30}
-                        },
-                        "required": ["device_id", "host", "device_type", "username", "password"]
-                    }
-                ),
-                types.Tool(
-                    name="disconnect_device",
-                    description="Disconnect from a network device",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "device_id": {"type": "string", "description": "Device identifier to disconnect"}
-                        },
-                        "required": ["device_id"]
-                    }
-                ),
-                types.Tool(
-                    name="send_command",
-                    description="Send a command to a connected network device",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "device_id": {"type": "string", "description": "Device identifier"},
-                            "command": {"type": "string", "description": "Command to execute"},
-                            "use_textfsm": {"type": "boolean", "description": "Parse output with TextFSM", "default": False},
-                            "strip_prompt": {"type": "boolean", "description": "Strip device prompt from output", "default": True},
-                            "strip_command": {"type": "boolean", "description": "Strip command from output", "default": True}
-                        },
-                        "required": ["device_id", "command"]
-                    }
-                ),
-                types.Tool(
-                    name="send_config_commands",
-                    description="Send configuration commands to a network device",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "device_id": {"type": "string", "description": "Device identifier"},
-                            "commands": {
-                                "type": "array",
-                                "items": {"type": "string"},
-                                "description": "List of configuration commands"
-                            },
-                            "exit_config_mode": {"type": "boolean", "description": "Exit config mode after commands", "default": True}
-                        },
-                        "required": ["device_id", "commands"]
-                    }
-                ),
-                types.Tool(
-                    name="get_device_info",
-                    description="Get basic device information",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "device_id": {"type": "string", "description": "Device identifier"}
-                        },
-                        "required": ["device_id"]
-                    }
-                ),
-                types.Tool(
-                    name="list_connected_devices",
-                    description="List all currently connected devices",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {}
-                    }
-                )
-            ]
+            return TOOLS
         
         @self.server.call_tool()
         async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent]:
             """Handle tool calls"""
             try:
-                if name == "connect_device":
-                    return await self._connect_device(**arguments)
-                elif name == "disconnect_device":
-                    return await self._disconnect_device(**arguments)
-                elif name == "send_command":
-                    return await self._send_command(**arguments)
-                elif name == "send_config_commands":
-                    return await self._send_config_commands(**arguments)
-                elif name == "get_device_info":
-                    return await self._get_device_info(**arguments)
-                elif name == "list_connected_devices":
-                    return await self._list_connected_devices()
-                else:
+                handler = self._tool_dispatch.get(name)
+                if handler is None:
                     raise ValueError(f"Unknown tool: {name}")
+                return await handler(**arguments)
             except Exception as e:
                 logger.error(f"Error in tool {name}: {str(e)}")
-                return [types.TextContent(type="text", text=f"Error: {str(e)}")]
+                return _text(f"Error: {str(e)}")
     
     async def _connect_device(self, device_id: str, host: str, device_type: str, 
                             username: str, password: str, port: int = 22, 
-                            secret: Optional[str] = None, timeout: int = 30) -> list[types.TextContent]:
+                            secret: Optional[str] = None, timeout: int = 30,
+                            fast_cli: bool = True) -> list[types.TextContent]:
         """Connect to a network device"""
         try:
-            # Store device configuration
             config = DeviceConfig(
                 host=host,
                 device_type=device_type,
@@ -208,9 +610,17 @@ class NetMikoMCPServer:
                 password=password,
                 port=port,
                 secret=secret,
-                timeout=timeout
+                timeout=timeout,
+                fast_cli=fast_cli
             )
-            self.device_configs[device_id] = config
+            
+            # Identical reconnects of a live session are a no-op
+            if (self.device_configs.get(device_id) == config and device_id in self.connections
+                    and await self._run_on_device(device_id, self.connections[device_id].is_alive)):
+                return _text(f"Already connected to {device_id}")
+            
+            # Store device configuration
+            self.add_device_config(device_id, config)
             
             # Create connection parameters
             device_params = {
@@ -220,139 +630,120 @@ class NetMikoMCPServer:
                 'password': password,
                 'port': port,
                 'timeout': timeout,
+                'fast_cli': fast_cli,
+                **({'secret': secret} if secret else {}),
             }
             
-            if secret:
-                device_params['secret'] = secret
-            
-            # Establish connection
-            connection = ConnectHandler(**device_params)
+            # Reuse a pooled connection or establish a new one
+            key = pool_key(config)
+            connection, _ = await self._pool.acquire(key, 
+                                                  lambda: self._run_blocking(ConnectHandler, **device_params))
+            previous_key = self._device_keys.get(device_id)
             self.connections[device_id] = connection
+            self._device_keys[device_id] = key
+            if previous_key not in (None, key) and previous_key not in self._device_keys.values():
+                await self._pool.remove(previous_key)
+            self._prune_bindings()
             
             # Get device prompt for verification
-            prompt = connection.find_prompt()
+            prompt = await self._get_prompt(device_id)
             
-            return [types.TextContent(
-                type="text",
-                text=f"Successfully connected to device {device_id} ({host}). Device prompt: {prompt}"
-            )]
+            return _text(f"Successfully connected to device {device_id} ({host}). Device prompt: {prompt}")
             
         except NetmikoAuthenticationException as e:
-            return [types.TextContent(
-                type="text",
-                text=f"Authentication failed for device {device_id}: {str(e)}"
-            )]
+            return _text(f"Authentication failed for device {device_id}: {str(e)}")
         except NetmikoTimeoutException as e:
-            return [types.TextContent(
-                type="text",
-                text=f"Connection timeout for device {device_id}: {str(e)}"
-            )]
+            return _text(f"Connection timeout for device {device_id}: {str(e)}")
         except Exception as e:
-            return [types.TextContent(
-                type="text",
-                text=f"Failed to connect to device {device_id}: {str(e)}"
-            )]
+            return _text(f"Failed to connect to device {device_id}: {str(e)}")
     
     async def _disconnect_device(self, device_id: str) -> list[types.TextContent]:
         """Disconnect from a network device"""
         if device_id not in self.connections:
-            return [types.TextContent(
-                type="text",
-                text=f"Device {device_id} is not connected"
-            )]
+            return _text(f"Device {device_id} is not connected")
         
         try:
-            connection = self.connections[device_id]
-            connection.disconnect()
             del self.connections[device_id]
+            key = self._device_keys.pop(device_id)
+            # Close the session unless another device is still bound to it
+            if key not in self._device_keys.values():
+                await self._pool.remove(key)
             
-            return [types.TextContent(
-                type="text",
-                text=f"Successfully disconnected from device {device_id}"
-            )]
+            return _text(f"Successfully disconnected from device {device_id}")
         except Exception as e:
-            return [types.TextContent(
-                type="text",
-                text=f"Error disconnecting from device {device_id}: {str(e)}"
-            )]
+            return _text(f"Error disconnecting from device {device_id}: {str(e)}")
     
     async def _send_command(self, device_id: str, command: str, 
                           use_textfsm: bool = False, strip_prompt: bool = True,
                           strip_command: bool = True) -> list[types.TextContent]:
         """Send a command to a network device"""
         if device_id not in self.connections:
-            return [types.TextContent(
-                type="text",
-                text=f"Device {device_id} is not connected. Please connect first."
-            )]
+            return _text(ERR_NOT_CONNECTED_TMPL.format(device_id))
         
         try:
             connection = self.connections[device_id]
-            output = connection.send_command(
+            output = await self._run_on_device(
+                device_id,
+                connection.send_command,
                 command,
-                use_textfsm=use_textfsm,
                 strip_prompt=strip_prompt,
                 strip_command=strip_command
             )
             
+            if use_textfsm:
+                # Parse with cached templates rather than NetMiko re-reading them per call
+                config = self.device_configs[device_id]
+                output = await self._run_blocking(_parse_textfsm, config.device_type, command, output)
+            
             if use_textfsm and isinstance(output, list):
                 # Format structured output
-                formatted_output = json.dumps(output, indent=2)
+                formatted_output = _dumps(output)
             else:
                 formatted_output = str(output)
             
-            return [types.TextContent(
-                type="text",
-                text=f"Command: {command}\n\nOutput:\n{formatted_output}"
-            )]
+            # Single join sized up front; output can be megabytes (e.g. show tech-support)
+            return _text("".join(("Command: ", command, "\n\nOutput:\n", formatted_output)))
             
         except Exception as e:
-            return [types.TextContent(
-                type="text",
-                text=f"Error executing command on device {device_id}: {str(e)}"
-            )]
+            return _text(f"Error executing command on device {device_id}: {str(e)}")
     
     async def _send_config_commands(self, device_id: str, commands: List[str],
-                                  exit_config_mode: bool = True) -> list[types.TextContent]:
+                                  exit_config_mode: bool = True,
+                                  cmd_verify: bool = False) -> list[types.TextContent]:
         """Send configuration commands to a network device"""
         if device_id not in self.connections:
-            return [types.TextContent(
-                type="text",
-                text=f"Device {device_id} is not connected. Please connect first."
-            )]
+            return _text(ERR_NOT_CONNECTED_TMPL.format(device_id))
         
         try:
             connection = self.connections[device_id]
-            output = connection.send_config_set(
+            output = await self._run_on_device(
+                device_id,
+                connection.send_config_set,
                 commands,
-                exit_config_mode=exit_config_mode
+                exit_config_mode=exit_config_mode,
+                cmd_verify=cmd_verify,
+                read_timeout=CONFIG_READ_TIMEOUT
             )
+            # Config changes such as a new hostname alter the prompt
+            self._invalidate_prompt(device_id)
             
-            return [types.TextContent(
-                type="text",
-                text=f"Configuration commands executed:\n{chr(10).join(commands)}\n\nOutput:\n{output}"
-            )]
+            return _text("".join((
+                "Configuration commands executed:\n", "\n".join(commands), "\n\nOutput:\n", output
+            )))
             
         except Exception as e:
-            return [types.TextContent(
-                type="text",
-                text=f"Error executing config commands on device {device_id}: {str(e)}"
-            )]
+            return _text(f"Error executing config commands on device {device_id}: {str(e)}")
     
     async def _get_device_info(self, device_id: str) -> list[types.TextContent]:
         """Get device information"""
         if device_id not in self.connections:
-            return [types.TextContent(
-                type="text",
-                text=f"Device {device_id} is not connected. Please connect first."
-            )]
+            return _text(ERR_NOT_CONNECTED_TMPL.format(device_id))
         
         try:
-            connection = self.connections[device_id]
             config = self.device_configs[device_id]
             
             # Get basic device info
-            prompt = connection.find_prompt()
+            prompt = await self._get_prompt(device_id)
             
             device_info = {
                 "device_id": device_id,
@@ -364,56 +755,83 @@ class NetMikoMCPServer:
                 "session_timeout": config.session_timeout
             }
             
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(device_info, indent=2)
-            )]
+            return _text(_dumps(device_info))
             
         except Exception as e:
-            return [types.TextContent(
-                type="text",
-                text=f"Error getting device info for {device_id}: {str(e)}"
-            )]
+            return _text(f"Error getting device info for {device_id}: {str(e)}")
     
     async def _list_connected_devices(self) -> list[types.TextContent]:
         """List all connected devices"""
         if not self.connections:
-            return [types.TextContent(
-                type="text",
-                text="No devices currently connected"
-            )]
+            return _text("No devices currently connected")
+        
+        # Probe all prompts concurrently so wall time is the slowest device, not the sum
+        devices = [(device_id, self.device_configs[device_id])
+                   for device_id in self.connections if device_id in self.device_configs]
+        prompts = await asyncio.gather(
+            *(self._get_prompt(device_id) for device_id, _ in devices),
+            return_exceptions=True
+        )
         
         connected_devices = []
-        for device_id, connection in self.connections.items():
-            config = self.device_configs.get(device_id)
-            if config:
-                connected_devices.append({
-                    "device_id": device_id,
-                    "host": config.host,
-                    "device_type": config.device_type,
-                    "prompt": connection.find_prompt()
-                })
+        for (device_id, config), prompt in zip(devices, prompts):
+            device_info = {
+                "device_id": device_id,
+                "host": config.host,
+                "device_type": config.device_type,
+                "prompt": None if isinstance(prompt, Exception) else prompt
+            }
+            if isinstance(prompt, Exception):
+                device_info["error"] = str(prompt)
+            connected_devices.append(device_info)
         
-        return [types.TextContent(
-            type="text",
-            text=json.dumps(connected_devices, indent=2)
-        )]
+        return _text(_dumps(connected_devices))
+    
+    async def _reaper(self):
+        """Periodically evict idle and aged-out pooled connections"""
+        while True:
+            await asyncio.sleep(POOL_REAP_INTERVAL)
+            expired = await self._pool.reap()
+            if expired:
+                self._prune_bindings()
+                logger.info(f"Reaped {len(expired)} idle connection(s)")
+    
+    def _prune_bindings(self):
+        """Forget devices whose pooled connection has been evicted"""
+        for device_id, key in list(self._device_keys.items()):
+            if key not in self._pool:
+                del self._device_keys[device_id]
+                self.connections.pop(device_id, None)
     
     async def run(self):
         """Run the MCP server"""
-        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="netmiko-mcp-server",
-                    server_version="1.0.0",
-                    capabilities=self.server.get_capabilities(
-                        notification_options=NotificationOptions(),
-                        experimental_capabilities={}
+        reaper = asyncio.create_task(self._reaper())
+        try:
+            await self._serve()
+        finally:
+            reaper.cancel()
+            await self._pool.close_all()
+    
+    async def _serve(self):
+        """Serve MCP requests over stdio"""
+        stdout = BatchedStdout() if BATCH_STDIO else None
+        try:
+            async with mcp.server.stdio.stdio_server(stdout=stdout) as (read_stream, write_stream):
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    InitializationOptions(
+                        server_name="netmiko-mcp-server",
+                        server_version="1.0.0",
+                        capabilities=self.server.get_capabilities(
+                            notification_options=NotificationOptions(),
+                            experimental_capabilities={}
+                        )
                     )
                 )
-            )
+        finally:
+            if stdout is not None:
+                await stdout.aclose()
 
 
 async def main():
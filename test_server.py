@@ -6,9 +6,55 @@ Tests the server functionality without requiring actual network devices
 
 import asyncio
 import json
+import os
+import stat
+import tempfile
+import time
+import mcp_server
+from cli import load_config
+from netmiko.utilities import get_structured_data_textfsm
 from mcp_server import NetMikoMCPServer
 
 
+class StubConnectHandler:
+    """Stand-in for NetMiko's ConnectHandler that accepts only one password"""
+    
+    PASSWORD = "secret"
+    instances = []
+    fail_next = False
+    
+    def __init__(self, **params):
+        time.sleep(0.02)
+        if StubConnectHandler.fail_next:
+            StubConnectHandler.fail_next = False
+            raise mcp_server.NetmikoTimeoutException("Connection timed out")
+        if params["password"] != self.PASSWORD:
+            raise mcp_server.NetmikoAuthenticationException("Authentication failed")
+        self.params = params
+        self.closed = False
+        self.busy = False
+        StubConnectHandler.instances.append(self)
+    
+    def is_alive(self):
+        assert not self.busy, "channel used concurrently"
+        return not self.closed
+    
+    def find_prompt(self):
+        return "R1#"
+    
+    def send_command(self, command, **kwargs):
+        self.busy = True
+        try:
+            time.sleep(0.05)
+            return f"output of {command} on {self.params['host']}"
+        finally:
+            self.busy = False
+    
+    def disconnect(self):
+        assert not self.busy, "disconnected while in use"
+        self.closed = True
+
+
 async def test_server_functionality():
     """Test basic server functionality"""
     print("Testing NetMiko MCP Server Functionality")
@@ -63,5 +109,243 @@ async def test_server_functionality():
     print("All error handling is working as expected.")
 
 
+async def test_connection_pool():
+    """Test connection pool reuse, isolation and eviction against a stub device"""
+    print("\nTesting connection pool")
+    print("=" * 50)
+    
+    StubConnectHandler.instances = []
+    original_handler = mcp_server.ConnectHandler
+    mcp_server.ConnectHandler = StubConnectHandler
+    try:
+        server = NetMikoMCPServer()
+        device = dict(host="10.0.0.1", device_type="cisco_ios", username="admin")
+        
+        print("\n1. Reconnecting with the same credentials reuses the session...")
+        await server._connect_device("a", password="secret", **device)
+        await server._connect_device("b", password="secret", **device)
+        assert len(StubConnectHandler.instances) == 1
+        print(f"Sessions opened: {len(StubConnectHandler.instances)}")
+        
+        print("\n2. A wrong password never gets the pooled session...")
+        result = await server._connect_device("c", password="WRONG", **device)
+        assert result[0].text.startswith("Authentication failed"), result[0].text
+        assert "c" not in server.connections
+        print(f"Result: {result[0].text}")
+        
+        print("\n3. Different connection parameters open a separate session...")
+        await server._connect_device("d", password="secret", timeout=5, **device)
+        assert len(StubConnectHandler.instances) == 2
+        print(f"Sessions opened: {len(StubConnectHandler.instances)}")
+        
+        print("\n4. Opting out of fast_cli opens a session without it...")
+        await server._connect_device("slow", password="secret", fast_cli=False, **device)
+        assert len(StubConnectHandler.instances) == 3
+        assert StubConnectHandler.instances[-1].params["fast_cli"] is False
+        await server._disconnect_device("slow")
+        print(f"fast_cli: {StubConnectHandler.instances[-1].params['fast_cli']}")
+        
+        print("\n5. Disconnect closes a session once its last device is gone...")
+        shared = StubConnectHandler.instances[0]
+        await server._disconnect_device("a")
+        assert not shared.closed
+        await server._disconnect_device("b")
+        assert shared.closed
+        assert len(server._pool) == 1
+        print(f"Shared session closed: {shared.closed}")
+        
+        print("\n6. Reaping waits for a busy session to finish...")
+        server._pool.idle_timeout = -1
+        command = asyncio.create_task(server._send_command("d", "show version"))
+        await asyncio.sleep(0.01)
+        assert await server._pool.reap() == []
+        await command
+        reaped = await server._pool.reap()
+        server._prune_bindings()
+        assert len(reaped) == 1 and not server.connections
+        assert not server._pool._key_locks and not server._pool._channel_locks
+        print(f"Reaped sessions: {len(reaped)}")
+        
+        print("\n7. Eviction at max size skips sessions in use...")
+        server._pool.idle_timeout = 300
+        server._pool.max_size = 1
+        await server._connect_device("e", password="secret", **device)
+        command = asyncio.create_task(server._send_command("e", "show version"))
+        await asyncio.sleep(0.01)
+        await server._connect_device("f", password="secret", port=2222, **device)
+        result = await command
+        assert "output of show version" in result[0].text, result[0].text
+        print(f"Pooled sessions: {len(server._pool)}")
+        
+        print("\n8. A failed connect does not let queued connects open duplicate sessions...")
+        server._pool.max_size = 100
+        opened = len(StubConnectHandler.instances)
+        race = dict(device, host="10.0.0.2")
+        StubConnectHandler.fail_next = True
+        failing = asyncio.create_task(server._connect_device("g", password="secret", **race))
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(server._connect_device("h", password="secret", **race))
+        await failing
+        late = asyncio.create_task(server._connect_device("i", password="secret", **race))
+        await asyncio.gather(waiting, late)
+        assert len(StubConnectHandler.instances) == opened + 1
+        assert server.connections["h"] is server.connections["i"]
+        print(f"Sessions opened: {len(StubConnectHandler.instances) - opened}")
+    finally:
+        mcp_server.ConnectHandler = original_handler
+    
+    print("\n" + "=" * 50)
+    print("Connection pool test completed successfully!")
+
+
+def test_config_cache():
+    """Test the JSON sidecar cache used when loading YAML configs"""
+    print("\nTesting config cache")
+    print("=" * 50)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = os.path.join(tmp_dir, "config.yaml")
+        cache = config + ".cache.json"
+        with open(config, "w") as f:
+            f.write("devices:\n  router1:\n    host: 10.0.0.1\n    password: hunter2\n")
+        os.chmod(config, 0o600)
+        
+        print("\n1. First load writes a cache with the config's permissions...")
+        first = load_config(config)
+        assert stat.S_IMODE(os.stat(cache).st_mode) == 0o600
+        print(f"Cache mode: {oct(stat.S_IMODE(os.stat(cache).st_mode))}")
+        
+        print("\n2. Second load is served from the cache...")
+        with open(cache) as f:
+            header = f.readline()
+        with open(cache, "w") as f:
+            f.write(header + '{"from_cache": true}')
+        assert load_config(config) == {"from_cache": True}
+        
+        print("\n3. Changing the config invalidates the cache...")
+        os.utime(config, (time.time() + 10, time.time() + 10))
+        assert load_config(config) == first
+        
+        print("\n4. Replacing the config with the same mtime invalidates the cache...")
+        replacement = os.path.join(tmp_dir, "replacement.yaml")
+        with open(replacement, "w") as f:
+            f.write("devices:\n  router2:\n    host: 10.0.0.2\n    password: hunter2\n")
+        os.chmod(replacement, 0o600)
+        mtime_ns = os.stat(config).st_mtime_ns
+        os.utime(replacement, ns=(mtime_ns, mtime_ns))
+        os.replace(replacement, config)
+        assert load_config(config) == {"devices": {"router2": {"host": "10.0.0.2", "password": "hunter2"}}}
+        
+        print("\n5. Configs with non-string keys are never cached...")
+        numeric = os.path.join(tmp_dir, "numeric.yaml")
+        with open(numeric, "w") as f:
+            f.write("devices:\n  1:\n    host: 10.0.0.1\n")
+        assert load_config(numeric) == {"devices": {1: {"host": "10.0.0.1"}}}
+        assert not os.path.exists(numeric + ".cache.json")
+        assert sorted(os.listdir(tmp_dir)) == ["config.yaml", "config.yaml.cache.json", "numeric.yaml"]
+    
+    print("\n" + "=" * 50)
+    print("Config cache test completed successfully!")
+
+
+def test_textfsm_cache():
+    """Test that cached TextFSM templates parse exactly like NetMiko"""
+    print("\nTesting TextFSM template cache")
+    print("=" * 50)
+    
+    raw_output = (
+        "Interface              IP-Address      OK? Method Status                Protocol\n"
+        "GigabitEthernet0/0     10.0.0.1        YES manual up                    up\n"
+        "GigabitEthernet0/1     unassigned      YES unset  administratively down down\n"
+    )
+    expected = get_structured_data_textfsm(raw_output, platform="cisco_ios", command="show ip interface brief")
+    assert isinstance(expected, list)
+    
+    print("\n1. Cached template matches NetMiko, including on repeat parses...")
+    for _ in range(2):
+        assert mcp_server._parse_textfsm("cisco_ios", "show ip interface brief", raw_output) == expected
+    
+    print("\n2. Padded commands are stripped before the index lookup...")
+    assert mcp_server._parse_textfsm("cisco_ios", "  show ip interface brief \n", raw_output) == expected
+    
+    print("\n3. Unknown commands return the raw output...")
+    assert mcp_server._parse_textfsm("cisco_ios", "show bogus", raw_output) == raw_output
+    
+    print("\n" + "=" * 50)
+    print("TextFSM template cache test completed successfully!")
+
+
+async def test_batched_stdout():
+    """Test that BatchedStdout coalesces flushed messages into few writes"""
+    print("\nTesting batched stdout")
+    print("=" * 50)
+    
+    read_fd, write_fd = os.pipe()
+    writes = []
+    original_write = mcp_server.os.write
+    
+    def counting_write(fd, data):
+        writes.append(len(data))
+        return original_write(fd, data)
+    
+    mcp_server.os.write = counting_write
+    try:
+        stdout = mcp_server.BatchedStdout(fd=write_fd)
+        
+        print("\n1. A burst of flushed messages shares one write...")
+        for i in range(10):
+            await stdout.write(json.dumps({"id": i}) + "\n")
+            await stdout.flush()
+        await asyncio.sleep(0.05)
+        assert len(writes) == 1
+        print(f"Writes for 10 messages: {len(writes)}")
+        
+        print("\n2. A full buffer is written without waiting...")
+        await stdout.write("x" * mcp_server.BATCH_STDIO_MAX_BUFFER + "\n")
+        assert len(writes) == 2
+        
+        print("\n3. Closing writes out anything still buffered...")
+        await stdout.write("tail\n")
+        await stdout.flush()
+        await stdout.aclose()
+        assert len(writes) == 3
+    finally:
+        mcp_server.os.write = original_write
+        os.close(write_fd)
+    
+    with os.fdopen(read_fd, "rb") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 12 and lines[-1] == b"tail"
+    
+    print("\n4. A failed background write surfaces on the next call...")
+    read_fd, write_fd = os.pipe()
+    os.close(read_fd)
+    try:
+        stdout = mcp_server.BatchedStdout(fd=write_fd)
+        await stdout.write("lost\n")
+        await stdout.flush()
+        await asyncio.sleep(0.05)
+        for call in (lambda: stdout.write("more\n"), stdout.flush, stdout.aclose):
+            try:
+                await call()
+            except BrokenPipeError:
+                continue
+            raise AssertionError("write to a closed pipe did not raise")
+    finally:
+        os.close(write_fd)
+    print("BrokenPipeError raised from write, flush and aclose")
+    
+    print("\n" + "=" * 50)
+    print("Batched stdout test completed successfully!")
+
+
+async def main():
+    await test_server_functionality()
+    await test_connection_pool()
+    test_config_cache()
+    test_textfsm_cache()
+    await test_batched_stdout()
+
+
 if __name__ == "__main__":
-    asyncio.run(test_server_functionality())
+    asyncio.run(main())